@@ -1,13 +1,25 @@
 import os
 import sys
-import json
+import re
+import asyncio
+import hashlib
 import argparse
-from typing import Dict, List, Tuple, Optional
+import traceback
+from typing import Any, Dict, List, Tuple
 from pathlib import Path
 
 # Import the existing pipeline components
 sys.path.append(str(Path(__file__).parent))
-from run_pipeline import main as run_pipeline  # Import main function from run_pipeline
+from run_pipeline import DYNAMIC_PROMPT_MARKER, LLM_CACHE, LLM_CONCURRENCY, positive_int, write_if_changed
+
+try:
+    import uvloop
+    run_async = uvloop.run
+except ImportError:  # uvloop is not available on Windows
+    run_async = asyncio.run
+
+# Error patterns that have targeted guidance in generate_improved_prompt
+GUIDANCE_RE = re.compile(r'sharpe_ratio|profit_factor|broadcast|missing|not found', re.IGNORECASE)
 
 def load_prompt(prompt_path: str) -> str:
     """Load the prompt template from file."""
@@ -19,46 +31,35 @@ def save_prompt(prompt_path: str, content: str) -> None:
     with open(prompt_path, 'w') as f:
         f.write(content)
 
-def extract_failure_reasons(output: str) -> List[str]:
-    """Extract failure reasons from the pipeline output."""
+def save_best_solution(results: List[Dict[str, Any]], accuracy: float) -> bool:
+    """Save the first passing trial's solution to best_solution.py.
+
+    Returns True if a passing solution was found.
+    """
+    for result in results:
+        if not result.get('passed'):
+            continue
+        solution_path = os.path.join('solutions', f"solution_{result['trial']}.py")
+        if not os.path.exists(solution_path):
+            continue
+        with open(solution_path, 'r', encoding='utf-8') as f:
+            code = f.read()
+        write_if_changed('best_solution.py', f"# Accuracy: {accuracy*100:.1f}%\n{code}")
+        return True
+    return False
+
+def extract_failure_reasons(results: List[Dict[str, Any]]) -> List[str]:
+    """Extract the distinct failure reasons from the pipeline's trial results."""
     failure_reasons = []
+    seen = set()
     
-    # Look for lines that contain failure information
-    for line in output.split('\n'):
-        line = line.strip()
-        # Match both the trial failure line and the error message that follows
-        if 'FAILED:' in line:
-            # Extract the error message part after 'FAILED:'
-            error_msg = line.split('FAILED:', 1)[1].strip()
-            # Clean up any trailing emojis or special characters
-            error_msg = error_msg.replace('❌', '').strip()
-            if error_msg and error_msg != 'Unknown error' and error_msg not in failure_reasons:
-                failure_reasons.append(error_msg)
-    
-    # If no explicit failure reasons found, try to extract from error messages
-    if not failure_reasons:
-        error_keywords = ['Error:', 'Exception:', 'Traceback', 'failed with error']
-        error_lines = [
-            line.strip() for line in output.split('\n')
-            if any(keyword in line for keyword in error_keywords)
-        ]
-        if error_lines:
-            failure_reasons.extend(error_lines[:3])  # Take first 3 error lines max
-    
-    # If still no reasons found, check for common issues in the output
-    if not failure_reasons:
-        if 'No module named' in output:
-            failure_reasons.append('Missing required Python module')
-        elif 'SyntaxError' in output:
-            failure_reasons.append('Syntax error in generated code')
-        elif 'NameError' in output:
-            failure_reasons.append('Undefined variable or function')
-        elif 'TypeError' in output:
-            failure_reasons.append('Type error in the code')
-    
-    # If we still don't have any reasons, add a generic one
-    if not failure_reasons and 'failed' in output.lower():
-        failure_reasons.append('Unknown error - check the full output for details')
+    for result in results:
+        if result.get('passed'):
+            continue
+        error_msg = str(result.get('error') or '').strip()
+        if error_msg and error_msg != 'Unknown error' and error_msg not in seen:
+            seen.add(error_msg)
+            failure_reasons.append(error_msg)
     
     return failure_reasons
 
@@ -68,33 +69,38 @@ def generate_improved_prompt(current_prompt: str, failure_reasons: List[str], at
         return current_prompt
     
     # Add a section for error analysis and guidance
-    error_guidance = "\n\n## Error Analysis and Guidance\n"
+    error_guidance = f"\n\n{DYNAMIC_PROMPT_MARKER}\n"
     error_guidance += f"This is attempt {attempt + 1}. Here are the issues from previous attempts:\n"
     
     # Add each failure reason with a counter
     for i, reason in enumerate(failure_reasons, 1):
         error_guidance += f"{i}. {reason}\n"
     
+    # Collect the error patterns present across all reasons in one pass
+    tags = set()
+    for reason in failure_reasons:
+        tags.update(match.lower() for match in GUIDANCE_RE.findall(str(reason)))
+    
     # Add specific guidance for common error patterns
-    if any("sharpe_ratio" in str(reason).lower() for reason in failure_reasons):
+    if "sharpe_ratio" in tags:
         error_guidance += "\nIMPORTANT: To fix Sharpe ratio issues:\n"
         error_guidance += "- Ensure you're not dividing by zero in Sharpe ratio calculation\n"
         error_guidance += "- Make sure you have enough data points to calculate returns\n"
         error_guidance += "- Check that your returns have enough variability (not all zeros)\n"
     
-    if any("profit_factor" in str(reason).lower() for reason in failure_reasons):
+    if "profit_factor" in tags:
         error_guidance += "\nIMPORTANT: To fix profit factor calculation:\n"
         error_guidance += "- Calculate as (total profit / total loss)\n"
         error_guidance += "- Handle the case where total loss is zero\n"
         error_guidance += "- Ensure you're aggregating profits and losses correctly\n"
     
-    if any("broadcast" in str(reason).lower() for reason in failure_reasons):
+    if "broadcast" in tags:
         error_guidance += "\nIMPORTANT: To fix array shape/broadcast errors:\n"
         error_guidance += "- Check that all arrays have compatible shapes before operations\n"
         error_guidance += "- Verify the lengths of your signals and price arrays match\n"
         error_guidance += "- Use numpy's reshape() or np.newaxis if needed to align dimensions\n"
     
-    if any("missing" in str(reason).lower() or "not found" in str(reason).lower() for reason in failure_reasons):
+    if "missing" in tags or "not found" in tags:
         error_guidance += "\nIMPORTANT: To fix missing components:\n"
         error_guidance += "- Ensure all required imports are included at the top of the file\n"
         error_guidance += "- Check that all variable names are defined before use\n"
@@ -108,19 +114,22 @@ def generate_improved_prompt(current_prompt: str, failure_reasons: List[str], at
     error_guidance += "4. Ensure all required indicators are properly calculated\n"
     
     # Insert the error guidance just before the implementation template
-    if "## Implementation Template" in current_prompt:
-        parts = current_prompt.split("## Implementation Template")
-        return parts[0] + error_guidance + "## Implementation Template" + parts[1]
+    head, marker, tail = current_prompt.partition("## Implementation Template")
+    if marker:
+        return head + error_guidance + marker + tail
     
     return current_prompt + error_guidance
 
-async def run_pipeline_with_retry() -> Tuple[float, str]:
+async def run_pipeline_with_retry(use_grader_cache: bool = True,
+                                  concurrency: int = LLM_CONCURRENCY,
+                                  use_llm_cache: bool = LLM_CACHE) -> Tuple[float, List[Dict[str, Any]]]:
     """Run the pipeline and handle retries with proper cleanup."""
     from run_pipeline import TradingPipeline
     
     try:
         # Create and run the pipeline
-        pipeline = TradingPipeline()
+        pipeline = TradingPipeline(use_grader_cache=use_grader_cache, concurrency=concurrency,
+                                   use_llm_cache=use_llm_cache)
         await pipeline.run()  # This populates pipeline.results
         
         # Calculate accuracy
@@ -128,15 +137,13 @@ async def run_pipeline_with_retry() -> Tuple[float, str]:
         total = len(pipeline.results) if pipeline.results else 1
         accuracy = passed / total if total > 0 else 0.0
         
-        # Generate output with trial results
-        output_lines = []
-        for i, result in enumerate(pipeline.results):
-            status = "✅ PASSED" if result.get('passed') else f"❌ FAILED: {result.get('error', 'Unknown error')}"
-            output_lines.append(f"Trial {i+1}: {status}")
-        
-        # Add summary
-        output = "\n".join(output_lines)
-        output += f"\n\n📊 Trial Results: {passed}/{total} passed ({accuracy*100:.1f}%)"
+        # Generate output with trial results and summary in a single join
+        parts = [
+            f"Trial {i+1}: " + ("✅ PASSED" if result.get('passed') else f"❌ FAILED: {result.get('error', 'Unknown error')}")
+            for i, result in enumerate(pipeline.results)
+        ]
+        parts.append(f"\n📊 Trial Results: {passed}/{total} passed ({accuracy*100:.1f}%)")
+        output = "\n".join(parts)
         
         # Print trial results
         print("\n" + "="*50)
@@ -145,40 +152,41 @@ async def run_pipeline_with_retry() -> Tuple[float, str]:
         print(output)
         print("="*50 + "\n")
         
-        return accuracy, output
+        return accuracy, pipeline.results
         
     except Exception as e:
-        error_msg = f"Error in pipeline: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
-        return 0.0, error_msg
+        print(f"Error in pipeline: {str(e)}\n{traceback.format_exc()}")
+        return 0.0, [{'trial': None, 'passed': False, 'error': f"Error in pipeline: {str(e)}"}]
 
-def run_auto_pipeline(prompt_path: str, max_attempts: int = 10, target_accuracy: float = 0.3) -> tuple[bool, float]:
-    """Run the pipeline with automatic prompt improvement."""
+async def run_auto_pipeline(prompt_path: str, max_attempts: int = 10, target_accuracy: float = 0.3,
+                      use_grader_cache: bool = True, concurrency: int = LLM_CONCURRENCY,
+                      use_llm_cache: bool = LLM_CACHE) -> tuple[bool, float, int]:
+    """Run the pipeline with automatic prompt improvement.
+
+    Returns (success, best accuracy, number of attempts actually run).
+    """
     original_prompt = load_prompt(prompt_path)
     current_prompt = original_prompt
     best_accuracy = 0.0
     best_prompt = original_prompt
+    seen_signatures = set()
+    attempts_made = 0
     
     for attempt in range(max_attempts):
+        attempts_made = attempt + 1
         print(f"\n🔍 Attempt {attempt + 1}/{max_attempts}")
         print("-" * 50)
         
         # Update the prompt file
         save_prompt(prompt_path, current_prompt)
         
-        # Run the pipeline and capture output
-        from io import StringIO
-        from contextlib import redirect_stdout
-        
-        f = StringIO()
-        with redirect_stdout(f):
-            try:
-                accuracy, trial_output = asyncio.run(run_pipeline_with_retry())
-                output = f.getvalue() + "\n" + trial_output
-            except Exception as e:
-                print(f"Error running pipeline: {str(e)}")
-                output = f.getvalue()
-                accuracy = 0.0
+        # Run the pipeline; its output streams straight to the console
+        try:
+            accuracy, results = await run_pipeline_with_retry(use_grader_cache, concurrency, use_llm_cache)
+        except Exception as e:
+            print(f"Error running pipeline: {str(e)}")
+            results = []
+            accuracy = 0.0
         
         # Update best prompt if current accuracy is better
         if accuracy > best_accuracy:
@@ -186,16 +194,15 @@ def run_auto_pipeline(prompt_path: str, max_attempts: int = 10, target_accuracy:
             best_prompt = current_prompt
             
             # Save the best solution
-            with open('best_solution.py', 'w') as f:
-                f.write(open('solution.py').read())
+            save_best_solution(results, accuracy)
         
         # Check if we've reached the target accuracy
         if accuracy >= target_accuracy:
             print(f"\n🎉 Target accuracy of {target_accuracy*100}% achieved!")
-            return True, best_accuracy
+            return True, best_accuracy, attempts_made
         
         # If not, analyze failures and improve the prompt
-        failure_reasons = extract_failure_reasons(output)
+        failure_reasons = extract_failure_reasons(results)
         if not failure_reasons and accuracy > 0:
             print("No specific failures detected, but accuracy is still below target.")
             failure_reasons = [f"Accuracy {accuracy*100:.1f}% below target {target_accuracy*100}%"]
@@ -209,19 +216,26 @@ def run_auto_pipeline(prompt_path: str, max_attempts: int = 10, target_accuracy:
         print("\n❌ Failures detected:")
         for reason in failure_reasons:
             print(f"  - {reason}")
+        
+        # Stop once a failure set repeats; the guidance would not change
+        signature = hashlib.md5('|'.join(sorted(failure_reasons)).encode('utf-8')).hexdigest()
+        if signature in seen_signatures:
+            print("\n🔁 Same failures as a previous attempt; prompt has converged, stopping.")
+            break
+        seen_signatures.add(signature)
             
         # Generate improved prompt for next attempt
         current_prompt = generate_improved_prompt(original_prompt, failure_reasons, attempt)
     
     # If we get here, we didn't reach the target accuracy
-    print(f"\n❌ Failed to reach target accuracy of {target_accuracy*100}% after {max_attempts} attempts.")
+    print(f"\n❌ Failed to reach target accuracy of {target_accuracy*100}% after {attempts_made} attempts.")
     print(f"Best accuracy achieved: {best_accuracy*100:.1f}%")
     
     # Restore the best prompt
     save_prompt(prompt_path, best_prompt)
     print(f"\nRestored best performing prompt (accuracy: {best_accuracy*100:.1f}%)")
     
-    return False, best_accuracy
+    return False, best_accuracy, attempts_made
 
 def main():
     parser = argparse.ArgumentParser(description='Run the trading strategy pipeline with auto-prompting.')
@@ -231,6 +245,12 @@ def main():
                        help='Maximum number of auto-prompting attempts')
     parser.add_argument('--target', type=float, default=0.3,
                        help='Target accuracy (0-1) to achieve')
+    parser.add_argument('--no-grader-cache', action='store_true',
+                       help='Re-grade every solution instead of reusing cached verdicts')
+    parser.add_argument('--concurrency', type=positive_int, default=str(LLM_CONCURRENCY),
+                       help='Maximum number of model requests in flight at once')
+    parser.add_argument('--llm-cache', action='store_true', default=LLM_CACHE,
+                       help='Replay cached model responses for an unchanged prompt instead of sampling new ones')
     
     args = parser.parse_args()
     
@@ -244,13 +264,15 @@ def main():
         best_accuracy = 0.0
         try:
             # Get the best accuracy from run_auto_pipeline
-            success, best_accuracy = run_auto_pipeline(prompt_path, args.attempts, args.target)
+            success, best_accuracy, attempts_made = run_async(run_auto_pipeline(prompt_path, args.attempts, args.target,
+                                                                not args.no_grader_cache, args.concurrency,
+                                                                args.llm_cache))
             if success:
                 print("\n✅ Successfully reached target accuracy!")
                 print(f"Best solution saved to: best_solution.py")
                 return 0
             else:
-                print(f"\n❌ Failed to reach target accuracy of {args.target*100}% after {args.attempts} attempts.")
+                print(f"\n❌ Failed to reach target accuracy of {args.target*100}% after {attempts_made} attempts.")
                 if os.path.exists('best_solution.py'):
                     print(f"Best solution ({best_accuracy*100:.1f}% accuracy) saved to: best_solution.py")
                 return 1
@@ -271,11 +293,9 @@ def main():
         # Just run the pipeline once without modifications
         print("Running single pipeline execution...")
         try:
-            accuracy, _ = asyncio.run(run_pipeline_with_retry())
-            if accuracy > 0:
-                with open('solution.py', 'r') as f:
-                    with open('best_solution.py', 'w') as out_f:
-                        out_f.write(f"# Accuracy: {accuracy*100:.1f}%\n{f.read()}")
+            accuracy, results = run_async(run_pipeline_with_retry(not args.no_grader_cache, args.concurrency,
+                                                                  args.llm_cache))
+            if accuracy > 0 and save_best_solution(results, accuracy):
                 print(f"\n✅ Solution saved to: best_solution.py (Accuracy: {accuracy*100:.1f}%)")
             return 0
         except Exception as e:
@@ -1,12 +1,22 @@
 import os
 import re
 import sys
-import json
 import asyncio
+import time
+import signal
+import hashlib
+import tempfile
+import argparse
+import functools
 import warnings
 from pathlib import Path
-from typing import Dict, Any, List
-from anthropic import AsyncAnthropic
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Tuple
+import httpx
+import orjson
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 
 # Suppress warnings
@@ -21,30 +31,339 @@ load_dotenv()
 
 # Add task directory to path
 sys.path.append(str(Path(__file__).parent / 'task'))
+import task.grader
 from task.grader import grade_submission
 
+SYSTEM_PROMPT = "You are an AI that generates trading strategies. Respond ONLY with valid, executable Python code. Do not include markdown code blocks, explanations, or any text outside the Python code. The code must start with 'import' statements and include the complete predict_trade function."
+
+# Dataset to grade against; TASK_DATASET_PATH overrides it without touching the grader
+TICK_DATA_PATH = os.getenv('TASK_DATASET_PATH', os.path.join('task', 'data', 'tick_data.csv'))
+
+# First fenced code block in a model response
+CODE_BLOCK_RE = re.compile(r'```(?:python)?\s*(.*?)\s*```', re.DOTALL)
+
+# Anything from this heading on changes between auto-prompting attempts; the
+# text before it is sent as a cacheable prefix
+DYNAMIC_PROMPT_MARKER = "## Error Analysis and Guidance"
+
+# Model responses can be cached on disk so re-runs of an unchanged prompt skip
+# the API. Off by default: a cached run replays the same samples instead of
+# drawing new ones. Set LLM_CACHE=1 or pass --llm-cache to opt in.
+LLM_CACHE = os.getenv('LLM_CACHE', '0') == '1'
+LLM_CACHE_DIR = Path('.cache') / 'llm'
+_response_memo: Dict[str, str] = {}
+
+# Grader verdicts are cached by solution code, dataset and grader version
+GRADER_CACHE_DIR = Path('.cache') / 'grader'
+GRADER_CACHE_TTL = 24 * 60 * 60
+# Shared helper modules (solutions/_*.py) that graded code imports; editing one
+# must invalidate the cached verdicts too
+SOLUTION_HELPERS_DIR = Path(__file__).parent / 'solutions'
+
+@functools.lru_cache(maxsize=1)
+def _scan_tick_data(data_path: str, mtime: float, chunksize: int) -> Dict[str, Any]:
+    """Aggregate the tick CSV chunk by chunk; mtime is only part of the cache key."""
+    count = 0
+    value_sum = 0.0
+    value_min = np.inf
+    value_max = -np.inf
+    days = set()
+    first_timestamp = None
+    last_timestamp = None
+    
+    reader = pd.read_csv(
+        data_path,
+        names=['day', 'timestamp', 'value'],
+        header=0,
+        chunksize=chunksize
+    )
+    for chunk in reader:
+        values = chunk['value'].to_numpy()
+        count += len(values)
+        value_sum += float(values.sum())
+        value_min = min(value_min, float(values.min()))
+        value_max = max(value_max, float(values.max()))
+        days.update(chunk['day'].unique())
+        if first_timestamp is None:
+            first_timestamp = chunk['timestamp'].iloc[0]
+        last_timestamp = chunk['timestamp'].iloc[-1]
+    
+    # Read back only the two rows either side of the 80/20 split; the C parser
+    # skips the preceding lines without materializing them. The header is line 0,
+    # so with an empty training split the skip would land on it instead.
+    train_size = int(count * 0.8)
+    if train_size == 0:
+        train_end = test_start = first_timestamp
+    else:
+        split = pd.read_csv(
+            data_path,
+            names=['day', 'timestamp', 'value'],
+            skiprows=train_size,
+            nrows=2
+        )['timestamp']
+        train_end, test_start = split.iloc[0], split.iloc[1]
+    return {
+        'rows': count,
+        'first_timestamp': pd.to_datetime(first_timestamp, format='ISO8601'),
+        'last_timestamp': pd.to_datetime(last_timestamp, format='ISO8601'),
+        'train_size': train_size,
+        'train_end': pd.to_datetime(train_end, format='ISO8601'),
+        'test_start': pd.to_datetime(test_start, format='ISO8601'),
+        'unique_days': len(days),
+        'min': value_min,
+        'max': value_max,
+        'mean': value_sum / count,
+    }
+
+def tick_data_stats(data_path: str = TICK_DATA_PATH, chunksize: int = 100_000) -> Dict[str, Any]:
+    """Summarize the tick data without materializing the whole file.
+
+    Results are memoized until the file changes.
+    """
+    return _scan_tick_data(data_path, os.path.getmtime(data_path), chunksize)
+
+# One client per process so its connection pool survives across pipeline runs
+_client: Optional[AsyncAnthropic] = None
+
+# Default cap on concurrent model requests, so parallel trials queue locally
+# instead of piling up on the provider's rate limits
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '8'))
+
+def get_client() -> AsyncAnthropic:
+    """Return the shared Anthropic client, creating it on first use.
+
+    Requests are multiplexed over HTTP/2 with a bounded, warm connection pool.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic(
+            api_key=os.getenv('ANTHROPIC_API_KEY'),
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        )
+    return _client
+
+# Grading is CPU-bound backtesting, so it runs in worker processes
+_grader_pool: Optional[ProcessPoolExecutor] = None
+
+# Seconds a single submission may run in a grader worker
+GRADER_TIMEOUT = float(os.getenv('GRADER_TIMEOUT', '120'))
+
+# Optional address-space cap per grader worker, in MB (unset means no cap)
+GRADER_MEMORY_LIMIT_MB = int(os.getenv('GRADER_MEMORY_LIMIT_MB', '0'))
+
+def _init_grader_worker() -> None:
+    """Silence solution warnings in grader workers, as in the main process."""
+    warnings.filterwarnings('ignore')
+    np.seterr(all='ignore')
+    if GRADER_MEMORY_LIMIT_MB > 0:
+        import resource
+        limit = GRADER_MEMORY_LIMIT_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def get_grader_pool() -> ProcessPoolExecutor:
+    """Return the shared grader process pool, creating it on first use."""
+    global _grader_pool
+    if _grader_pool is None:
+        _grader_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_grader_worker)
+    return _grader_pool
+
+def discard_grader_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken grader pool so the next grade starts a fresh one."""
+    global _grader_pool
+    if _grader_pool is pool:
+        _grader_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+class GradingTimeout(BaseException):
+    """Raised by the grading alarm.
+
+    A BaseException, so grade_submission's `except Exception` handlers cannot
+    turn it into an ordinary verdict.
+    """
+
+class GraderUnavailable(Exception):
+    """The grader produced no verdict of its own (worker crash or timeout)."""
+
+def _raise_grading_timeout(signum, frame):
+    raise GradingTimeout(f"Grading timed out after {GRADER_TIMEOUT:g}s")
+
+def _grade_in_worker(code: str, dataset_path: str) -> Tuple[bool, str, Dict[str, Any]]:
+    """Run grade_submission in a grader worker under a GRADER_TIMEOUT alarm.
+
+    The alarm only counts time spent running this submission, not time
+    queued behind others. Platforms without setitimer grade without a limit.
+    """
+    if not hasattr(signal, 'setitimer'):
+        return grade_submission(code, dataset_path)
+    previous = signal.signal(signal.SIGALRM, _raise_grading_timeout)
+    signal.setitimer(signal.ITIMER_REAL, GRADER_TIMEOUT)
+    try:
+        return grade_submission(code, dataset_path)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+# Content hashes of files this process has written, by path
+_written_hashes: Dict[str, str] = {}
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Atomically write content to path unless it already holds exactly that.
+
+    Returns True if the file was written.
+    """
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    if _written_hashes.get(path) == digest and os.path.exists(path):
+        return False
+    
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # A unique temp name keeps concurrent writers of the same path apart
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(content)
+    # mkstemp creates owner-only files; match what open() would have made
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    _written_hashes[path] = digest
+    return True
+
 class TradingPipeline:
-    def __init__(self):
-        # Initialize Anthropic client
-        self.client = AsyncAnthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+    def __init__(self, use_grader_cache: bool = True, concurrency: int = LLM_CONCURRENCY,
+                 use_llm_cache: bool = LLM_CACHE):
+        # Share the process-wide Anthropic client
+        self.client = get_client()
         self.model = 'claude-sonnet-4-20250514'
+        self.max_tokens = 2000
+        self.temperature = 0.7
+        self.use_cache = use_llm_cache
+        self.use_grader_cache = use_grader_cache
+        self.llm_semaphore = asyncio.Semaphore(concurrency)
         self.results = []
         print(f"🤖 Using Anthropic Claude")
         print(f"📦 Model: {self.model}")
         
-    async def get_model_response(self, prompt: str) -> str:
-        """Get response from the model."""
+    @staticmethod
+    def split_prompt(prompt: str) -> Tuple[str, str]:
+        """Split a prompt into its stable prefix and attempt-specific suffix."""
+        index = prompt.find(DYNAMIC_PROMPT_MARKER)
+        if index == -1:
+            return prompt, ""
+        return prompt[:index], prompt[index:]
+
+    def _cache_key(self, static_prefix: str, dynamic_suffix: str, trial_num: int) -> str:
+        """Hash everything that determines a response.
+
+        The trial number is part of the key so that parallel trials stay
+        independent samples instead of collapsing onto one cached answer.
+        """
+        key = f"{self.model}\0{SYSTEM_PROMPT}\0{static_prefix}\0{dynamic_suffix}\0{self.temperature}\0{self.max_tokens}\0{trial_num}"
+        return hashlib.blake2b(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _cached_response(key: str) -> Optional[str]:
+        """Return a cached response from memory or disk, if there is one."""
+        if key in _response_memo:
+            return _response_memo[key]
+        cache_file = LLM_CACHE_DIR / f'{key}.txt'
+        if cache_file.exists():
+            _response_memo[key] = cache_file.read_text(encoding='utf-8')
+            return _response_memo[key]
+        return None
+
+    async def prepare_prompt_cache(self, static_prefix: str, dynamic_suffix: str, num_trials: int) -> None:
+        """Warm the provider's prompt cache before sampling one response per trial.
+
+        The Messages API has no `n` parameter, so each sample is its own
+        request. Requests sent at the same moment all miss the prompt cache,
+        so a one-token request first writes the shared prefix to it and the
+        trials then only pay for reading it.
+        """
+        keys = [self._cache_key(static_prefix, dynamic_suffix, i) for i in range(num_trials)]
+        uncached = not self.use_cache or any(self._cached_response(key) is None for key in keys)
+        if num_trials > 1 and uncached:
+            await self._warm_prompt_cache(static_prefix)
+
+    async def get_model_response(self, static_prefix: str, dynamic_suffix: str = "", trial_num: int = 0) -> str:
+        """Get response from the model, reusing cached responses when possible."""
+        if not self.use_cache:
+            return await self._request_model_response(static_prefix, dynamic_suffix)
+
+        key = self._cache_key(static_prefix, dynamic_suffix, trial_num)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+
+        response = await self._request_model_response(static_prefix, dynamic_suffix)
+        if response:
+            _response_memo[key] = response
+            await asyncio.to_thread(write_if_changed, str(LLM_CACHE_DIR / f'{key}.txt'), response)
+        return response
+
+    @staticmethod
+    def _message_params(static_prefix: str, dynamic_suffix: str) -> Dict[str, Any]:
+        """Build the system and message blocks for a request.
+
+        The system prompt and the static part of the task prompt are marked as
+        cacheable so parallel trials and retries reuse the provider's prefix cache.
+        """
+        content = [{"type": "text", "text": static_prefix, "cache_control": {"type": "ephemeral"}}]
+        if dynamic_suffix:
+            content.append({"type": "text", "text": dynamic_suffix})
+        return {
+            'system': [
+                {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+            ],
+            'messages': [
+                {"role": "user", "content": content}
+            ],
+        }
+
+    async def _warm_prompt_cache(self, static_prefix: str) -> None:
+        """Write the cacheable prefix to the provider cache with a one-token request."""
         try:
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                temperature=0.7,
-                system="You are an AI that generates trading strategies. Respond ONLY with valid, executable Python code. Do not include markdown code blocks, explanations, or any text outside the Python code. The code must start with 'import' statements and include the complete predict_trade function.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return response.content[0].text
+            async with self.llm_semaphore:
+                await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1,
+                    **self._message_params(static_prefix, "")
+                )
+        except Exception as e:
+            print(f"Error warming prompt cache: {str(e)}")
+
+    async def _request_model_response(self, static_prefix: str, dynamic_suffix: str) -> str:
+        """Stream a response from the model.
+
+        Only the first fenced code block is kept by clean_response, so the
+        stream is closed as soon as that block's closing fence arrives.
+        """
+        try:
+            response = ""
+            fences = 0
+            search_from = 0
+            async with self.llm_semaphore:
+                async with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    **self._message_params(static_prefix, dynamic_suffix)
+                ) as stream:
+                    async for text in stream.text_stream:
+                        response += text
+                        while (fence := response.find('```', search_from)) != -1:
+                            fences += 1
+                            search_from = fence + 3
+                        # A fence may be split across chunks
+                        search_from = max(search_from, len(response) - 2)
+                        if fences >= 2:
+                            break
+                    usage = stream.current_message_snapshot.usage
+            cached_tokens = getattr(usage, 'cache_read_input_tokens', None) or 0
+            if cached_tokens:
+                print(f"♻️ Prompt cache hit: {cached_tokens} input tokens")
+            return response
         except Exception as e:
             print(f"Error: {str(e)}")
             return ""
@@ -52,23 +371,81 @@ class TradingPipeline:
     @staticmethod
     def clean_response(response: str) -> str:
         """Extract Python code from markdown response."""
-        code_blocks = re.findall(r'```(?:python)?\s*(.*?)\s*```', response, re.DOTALL)
-        return code_blocks[0].strip() if code_blocks else response
+        match = CODE_BLOCK_RE.search(response)
+        return match.group(1).strip() if match else response
+
+    @staticmethod
+    def _grader_cache_key(code: str, dataset_path: str) -> str:
+        """Hash the code together with the dataset path and the dataset, grader and shared helper modification times."""
+        helpers = '\0'.join(f"{p.name}:{p.stat().st_mtime}" for p in sorted(SOLUTION_HELPERS_DIR.glob('_*.py')))
+        key = f"{code}\0{os.path.abspath(dataset_path)}\0{os.path.getmtime(dataset_path)}\0{os.path.getmtime(task.grader.__file__)}\0{helpers}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    async def _run_grader(code: str, dataset_path: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """Run the grader on a worker process.
+
+        A submission that kills its worker breaks the whole shared pool and
+        fails every grade that was running on it. Each of those is retried
+        alone on a single-use pool, so only a submission that still crashes
+        on its own is reported as crashed.
+
+        Raises GraderUnavailable on a crash or timeout.
+        """
+        loop = asyncio.get_running_loop()
+        pool = get_grader_pool()
+        try:
+            return await loop.run_in_executor(pool, _grade_in_worker, code, dataset_path)
+        except GradingTimeout as e:
+            raise GraderUnavailable(str(e)) from None
+        except BrokenProcessPool:
+            discard_grader_pool(pool)
+
+        solo_pool = ProcessPoolExecutor(max_workers=1, initializer=_init_grader_worker)
+        try:
+            return await loop.run_in_executor(solo_pool, _grade_in_worker, code, dataset_path)
+        except GradingTimeout as e:
+            raise GraderUnavailable(str(e)) from None
+        except BrokenProcessPool:
+            raise GraderUnavailable("Grader worker crashed while running the submission") from None
+        finally:
+            solo_pool.shutdown(wait=False)
+
+    async def grade(self, code: str, dataset_path: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """Grade a solution, reusing the verdict for code that was already graded.
+
+        Only verdicts the grader itself returned are cached; a crash or
+        timeout fails this run without sticking to the code.
+        """
+        cache_file = None
+        if self.use_grader_cache:
+            cache_file = GRADER_CACHE_DIR / f'{self._grader_cache_key(code, dataset_path)}.json'
+            if cache_file.exists() and time.time() - cache_file.stat().st_mtime < GRADER_CACHE_TTL:
+                cached = orjson.loads(cache_file.read_bytes())
+                return cached['passed'], cached['message'], cached['metrics']
+
+        try:
+            passed, message, metrics = await self._run_grader(code, dataset_path)
+        except GraderUnavailable as e:
+            return False, str(e), {}
+        if cache_file is None:
+            return passed, message, metrics
+        await asyncio.to_thread(write_if_changed, str(cache_file), orjson.dumps({
+            'passed': passed,
+            'message': message,
+            'metrics': metrics
+        }, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8'))
+        return passed, message, metrics
 
     async def evaluate_solution(self, code: str, trial_num: int) -> Dict[str, Any]:
         """Evaluate a solution using the grader."""
         try:
-            # Save code to temp file
-            os.makedirs('temp', exist_ok=True)
-            temp_file = f'temp/temp_solution_{trial_num}.py'
-            with open(temp_file, 'w') as f:
-                f.write(code)
+            # Save code to temp file without blocking the event loop
+            await asyncio.to_thread(write_if_changed, f'temp/temp_solution_{trial_num}.py', code)
             
             # Grade the submission
-            dataset_path = os.path.join('task', 'data', 'tick_data.csv')
-            passed, message, metrics = await asyncio.to_thread(
-                grade_submission, code, dataset_path
-            )
+            dataset_path = TICK_DATA_PATH
+            passed, message, metrics = await self.grade(code, dataset_path)
             
             return {
                 'trial': trial_num,
@@ -85,10 +462,8 @@ class TradingPipeline:
                 'metrics': {}
             }
             
-    async def run_trial(self, trial_num: int, prompt: str) -> Dict[str, Any]:
-        """Run a single trial with minimal output."""
-        # Get model response
-        response = await self.get_model_response(prompt)
+    async def run_trial(self, trial_num: int, response: str) -> Dict[str, Any]:
+        """Evaluate a single trial's model response with minimal output."""
         if not response:
             return {'trial': trial_num, 'error': 'Empty response from model', 'passed': False}
         
@@ -104,12 +479,15 @@ class TradingPipeline:
         
         # Save successful solutions
         if result.get('passed'):
-            os.makedirs('solutions', exist_ok=True)
-            with open(f'solutions/solution_{trial_num}.py', 'w') as f:
-                f.write(solution_code)
+            await asyncio.to_thread(write_if_changed, f'solutions/solution_{trial_num}.py', solution_code)
         
         return result
 
+    async def sample_and_run_trial(self, trial_num: int, static_prefix: str, dynamic_suffix: str) -> Dict[str, Any]:
+        """Sample a trial's response and evaluate it as soon as it arrives."""
+        response = await self.get_model_response(static_prefix, dynamic_suffix, trial_num)
+        return await self.run_trial(trial_num, response)
+
     async def run(self, num_trials: int = 10):
         """Run the pipeline with clean output."""
         self.num_trials = num_trials
@@ -122,35 +500,30 @@ class TradingPipeline:
         
         # Load and show data stats
         try:
-            data_path = os.path.join('task', 'data', 'tick_data.csv')
-            # Read with header and proper column names
-            df = pd.read_csv(data_path, names=['day', 'timestamp', 'value'], header=0)
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            stats = tick_data_stats()
             
             # Calculate durations
-            total_duration = df['timestamp'].iloc[-1] - df['timestamp'].iloc[0]
+            total_duration = stats['last_timestamp'] - stats['first_timestamp']
             total_minutes = total_duration.total_seconds() / 60
             
             # Calculate split points
-            train_size = int(len(df) * 0.8)
-            train_duration = (df['timestamp'].iloc[train_size-1] - df['timestamp'].iloc[0]).total_seconds() / 60
-            test_duration = (df['timestamp'].iloc[-1] - df['timestamp'].iloc[train_size]).total_seconds() / 60
+            train_size = stats['train_size']
+            train_duration = (stats['train_end'] - stats['first_timestamp']).total_seconds() / 60
+            test_duration = (stats['last_timestamp'] - stats['test_start']).total_seconds() / 60
             
             print(f"\n📊 Dataset Stats:")
-            print(f"- Total Rows: {len(df):,}")
-            print(f"- First Timestamp: {df['timestamp'].iloc[0]}")
-            print(f"- Last Timestamp: {df['timestamp'].iloc[-1]}")
+            print(f"- Total Rows: {stats['rows']:,}")
+            print(f"- First Timestamp: {stats['first_timestamp']}")
+            print(f"- Last Timestamp: {stats['last_timestamp']}")
             print(f"- Total Duration: {total_minutes:.2f} minutes")
             print(f"- Data Split (80/20):")
             print(f"  - Training: {train_duration:.2f} minutes ({train_size} rows)")
-            print(f"  - Testing: {test_duration:.2f} minutes ({len(df)-train_size} rows)")
-            print(f"- Unique Days: {df['day'].nunique()}")
+            print(f"  - Testing: {test_duration:.2f} minutes ({stats['rows']-train_size} rows)")
+            print(f"- Unique Days: {stats['unique_days']}")
             print(f"- Value Stats:")
-            print(f"  - Min: {df['value'].min():.4f}")
-            print(f"  - Max: {df['value'].max():.4f}")
-            print(f"  - Mean: {df['value'].mean():.4f}")
+            print(f"  - Min: {stats['min']:.4f}")
+            print(f"  - Max: {stats['max']:.4f}")
+            print(f"  - Mean: {stats['mean']:.4f}")
             
         except Exception as e:
             print(f"\n⚠️ Could not load data stats: {str(e)}")
@@ -160,21 +533,28 @@ class TradingPipeline:
             prompt_path = os.path.join('task', 'prompt.txt')
             with open(prompt_path, 'r', encoding='utf-8') as f:
                 prompt = f.read()
+            static_prefix, dynamic_suffix = self.split_prompt(prompt)
             print(f"\n🚀 Starting {num_trials} trials...\n")
         except Exception as e:
             print(f"\n❌ Error loading prompt: {str(e)}")
             return
         
-        # Run trials
-        tasks = [self.run_trial(i, prompt) for i in range(num_trials)]
-        self.results = await asyncio.gather(*tasks)
+        # Run trials, grading each one while slower responses are still streaming
+        await self.prepare_prompt_cache(static_prefix, dynamic_suffix, num_trials)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(self.sample_and_run_trial(i, static_prefix, dynamic_suffix))
+                for i in range(num_trials)
+            ]
+        self.results = [task.result() for task in tasks]
         
-        # Print summary
+        # Print summary and save results without blocking the event loop
         self.print_summary()
+        await asyncio.to_thread(self.save_results)
 
     def print_summary(self):
         """Print clean summary of all trials."""
-        passed = sum(1 for r in self.results if r.get('passed'))
+        passed = sum(bool(r.get('passed')) for r in self.results)
         total = len(self.results)
         accuracy = passed / total * 100 if total > 0 else 0
         
@@ -190,38 +570,57 @@ class TradingPipeline:
         # Print any unique errors
         if passed < total:
             print("\nFailure Reasons:")
-            errors = {}
-            for r in self.results:
-                if not r.get('passed') and 'error' in r:
-                    errors[r['error']] = errors.get(r['error'], 0) + 1
+            errors = Counter(r['error'] for r in self.results if not r.get('passed') and 'error' in r)
             
-            for error, count in errors.items():
+            for error, count in errors.most_common():
                 print(f"- {error} (x{count})")
         
         print("=" * 50)
-        
-        # Save results to JSON
+
+    def save_results(self):
+        """Write the trial results to results/evaluation_results.json."""
         os.makedirs('results', exist_ok=True)
-        with open('results/evaluation_results.json', 'w') as f:
-            json.dump({
-                'timestamp': pd.Timestamp.now().isoformat(),
-                'total_trials': len(self.results),
-                'passed': sum(1 for r in self.results if r.get('passed')),
-                'results': [{
-                    'trial': r.get('trial'),
-                    'passed': r.get('passed'),
-                    'error': r.get('error'),
-                    'metrics': r.get('metrics')
-                } for r in self.results]
-            }, f, indent=2)
+        Path('results/evaluation_results.json').write_bytes(orjson.dumps({
+            'timestamp': pd.Timestamp.now().isoformat(),
+            'total_trials': len(self.results),
+            'passed': sum(bool(r.get('passed')) for r in self.results),
+            'results': [{
+                'trial': r.get('trial'),
+                'passed': r.get('passed'),
+                'error': r.get('error'),
+                'metrics': r.get('metrics')
+            } for r in self.results]
+        }, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1.
+
+    Pass the default as a string so argparse checks env-derived defaults too.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
+    parser = argparse.ArgumentParser(description='Run the trading strategy evaluation pipeline.')
+    parser.add_argument('--trials', type=int, default=10,
+                       help='Number of independent trials to sample and grade')
+    parser.add_argument('--no-grader-cache', action='store_true',
+                       help='Re-grade every solution instead of reusing cached verdicts')
+    parser.add_argument('--concurrency', type=positive_int, default=str(LLM_CONCURRENCY),
+                       help='Maximum number of model requests in flight at once')
+    parser.add_argument('--llm-cache', action='store_true', default=LLM_CACHE,
+                       help='Replay cached model responses for an unchanged prompt instead of sampling new ones')
+    args = parser.parse_args()
+
     # Clean up old files
     for f in Path('solutions').glob('solution_*.py'):
         f.unlink()
     
-    pipeline = TradingPipeline()
-    asyncio.run(pipeline.run())
+    pipeline = TradingPipeline(use_grader_cache=not args.no_grader_cache, concurrency=args.concurrency,
+                               use_llm_cache=args.llm_cache)
+    asyncio.run(pipeline.run(num_trials=args.trials))
     pipeline.print_summary()
     return pipeline
 
@@ -0,0 +1,54 @@
+import functools
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+
+def _minute_bars(batch) -> pd.DataFrame:
+    ticks = pd.Series(
+        batch.column('value').to_numpy(),
+        index=pd.DatetimeIndex(batch.column('timestamp').to_numpy(), name='timestamp'),
+    )
+    return ticks.resample('1min').ohlc()
+
+
+@functools.lru_cache(maxsize=4)
+def load_ohlc(path: str, mtime: float) -> pd.DataFrame:
+    """Parse the tick CSV and resample it to forward-filled 1-minute OHLC bars.
+
+    Keyed on (path, mtime) so repeated predict_trade calls in the same process
+    share one parse+resample, while an edited file is picked up again.
+    Callers must copy() the result before mutating it.
+
+    The file is streamed block by block and only per-minute bars are kept, so
+    peak memory grows with the number of minutes rather than ticks.
+    """
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(column_names=['day', 'timestamp', 'value'], skip_rows=1),
+        convert_options=pacsv.ConvertOptions(
+            column_types={'timestamp': pa.timestamp('ns'), 'value': pa.float64()},
+            include_columns=['timestamp', 'value'],
+        ),
+    )
+    bars = [_minute_bars(batch) for batch in reader] or [_minute_bars(reader.schema.empty_table())]
+    ohlc = pd.concat(bars)
+    if len(bars) > 1:
+        # A minute can straddle two blocks; merge its partial bars.
+        ohlc = ohlc.groupby(level=0).agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'})
+    return ohlc.asfreq('1min').ffill()
+
+
+def return_stats(strategy_returns: np.ndarray) -> Tuple[float, float, float]:
+    """Return the mean, population std and max drawdown of the strategy returns.
+
+    The drawdown is measured on the compounded wealth curve. Callers filter out
+    non-finite returns first.
+    """
+    wealth = np.cumprod(1 + strategy_returns)
+    running_max = np.maximum.accumulate(wealth)
+    drawdown = (running_max - wealth) / running_max
+    return np.mean(strategy_returns), np.std(strategy_returns), np.max(drawdown)
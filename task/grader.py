@@ -1,11 +1,34 @@
 import os
+import re
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import importlib.util
+import inspect
+import shutil
 import sys
+import tempfile
 import traceback
+import uuid
 from typing import Tuple, Dict, Any
 
+# Indicators to look for (case insensitive)
+COMMON_INDICATORS = [
+    'rsi', 'macd', 'ema', 'sma', 'bbands', 'atr', 'stoch', 'adx', 'cci', 'willr'
+]
+
+# Matches `talib.<indicator>` or ` <indicator>(` for any of the indicators above
+_INDICATOR_NAMES = '|'.join(COMMON_INDICATORS)
+INDICATOR_RE = re.compile(rf'talib\.({_INDICATOR_NAMES})| ({_INDICATOR_NAMES})\(')
+
+# Any comparison operator; `>=` and `<=` are covered by `>` and `<`
+CONDITION_RE = re.compile(r'[<>]|[=!]=')
+
+# Repo root; submissions may import shared helpers from it (e.g. the memoised
+# OHLC loader in solutions/_data_cache.py), whatever the working directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 def check_code_structure(module) -> Tuple[bool, str]:
     """Check for required function with minimal validation."""
     # Check for required function
@@ -13,7 +36,6 @@ def check_code_structure(module) -> Tuple[bool, str]:
         return False, "Function 'predict_trade' not found or is not callable."
     
     # Check function signature
-    import inspect
     sig = inspect.signature(module.predict_trade)
     params = list(sig.parameters.values())
     
@@ -32,23 +54,18 @@ def check_indicators_used(code: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (success: bool, message: str)
     """
-    # Define indicators to look for (case insensitive)
-    common_indicators = [
-        'rsi', 'macd', 'ema', 'sma', 'bbands', 'atr', 'stoch', 'adx', 'cci', 'willr'
-    ]
-    
     # Check for indicator usage in code (case insensitive)
     code_lower = code.lower()
     
-    # Look for any indicator usage
-    used_indicators = [ind for ind in common_indicators 
-                      if f"talib.{ind}" in code_lower or f" {ind}(" in code_lower]
+    # Look for any indicator usage in a single scan of the code
+    found = {m.group(1) or m.group(2) for m in INDICATOR_RE.finditer(code_lower)}
+    used_indicators = [ind for ind in COMMON_INDICATORS if ind in found]
     
     if not used_indicators:
         return False, "No technical indicators found. Use at least one indicator from TA-Lib."
         
     # Check if indicators are used in trading conditions
-    has_conditions = any(op in code_lower for op in ['>', '<', '>=', '<=', '==', '!='])
+    has_conditions = CONDITION_RE.search(code_lower) is not None
     
     if not has_conditions:
         return False, "Indicators found but not used in any trading conditions"
@@ -97,13 +114,17 @@ def check_metrics(metrics: Dict[str, Any]) -> Tuple[bool, str]:
 def load_and_validate_data(dataset_path: str) -> pd.DataFrame:
     """Load and validate the input data."""
     try:
-        # Read the CSV file with proper datetime parsing
-        df = pd.read_csv(
+        # Read the CSV file with pyarrow's multithreaded parser, typing the
+        # timestamp column during the parse
+        table = pacsv.read_csv(
             dataset_path,
-            names=['day', 'timestamp', 'value'],
-            parse_dates=['timestamp'],
-            index_col='timestamp'
+            read_options=pacsv.ReadOptions(column_names=['day', 'timestamp', 'value'], skip_rows=1),
+            convert_options=pacsv.ConvertOptions(
+                column_types={'timestamp': pa.timestamp('ns'), 'value': pa.float64()},
+                include_columns=['timestamp', 'value'],
+            ),
         )
+        df = table.to_pandas().set_index('timestamp')
         
         # Basic validation
         if len(df) < 10:
@@ -129,8 +150,11 @@ def grade_submission(submitted_code: str, dataset_path: str) -> Tuple[bool, str,
     Returns:
         Tuple of (passed: bool, message: str, metrics: dict)
     """
-    import tempfile
-    import uuid
+    # Check for indicator usage first; it only needs the source, so a
+    # submission without indicators fails before it is written and imported
+    indicators_ok, indicators_msg = check_indicators_used(submitted_code)
+    if not indicators_ok:
+        return False, f"Indicator check failed: {indicators_msg}", {}
     
     # Create a unique temp file
     temp_dir = tempfile.mkdtemp()
@@ -149,6 +173,8 @@ def grade_submission(submitted_code: str, dataset_path: str) -> Tuple[bool, str,
             
         module = importlib.util.module_from_spec(spec)
         sys.modules[module_name] = module
+        if REPO_ROOT not in sys.path:
+            sys.path.append(REPO_ROOT)
         
         try:
             spec.loader.exec_module(module)
@@ -159,11 +185,6 @@ def grade_submission(submitted_code: str, dataset_path: str) -> Tuple[bool, str,
         if not hasattr(module, 'predict_trade') or not callable(module.predict_trade):
             return False, "Function 'predict_trade' not found or not callable", {}
         
-        # Check for indicator usage
-        indicators_ok, indicators_msg = check_indicators_used(submitted_code)
-        if not indicators_ok:
-            return False, f"Indicator check failed: {indicators_msg}", {}
-        
         # Execute the prediction
         try:
             result = module.predict_trade(dataset_path)
@@ -214,14 +235,9 @@ def grade_submission(submitted_code: str, dataset_path: str) -> Tuple[bool, str,
         return False, f"Grading error: {str(e)}", {}
         
     finally:
-        # Clean up temp files
-        try:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-            if os.path.exists(temp_dir):
-                os.rmdir(temp_dir)
-        except Exception:
-            pass
+        # Clean up temp files, including any __pycache__ the submission
+        # left next to itself
+        shutil.rmtree(temp_dir, ignore_errors=True)
             
         # Clean up module
         if 'module_name' in locals() and module_name in sys.modules:
@@ -235,7 +251,7 @@ if __name__ == '__main__':
     with open('solution.py', 'r') as f:
         code = f.read()
     
-    passed, msg, metrics = grade_submission(code, 'data/tick_data.csv')
+    passed, msg, metrics = grade_submission(code, os.getenv('TASK_DATASET_PATH', 'data/tick_data.csv'))
     print(f"Passed: {passed}")
     print(f"Message: {msg}")
     if passed:
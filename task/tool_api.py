@@ -28,13 +28,15 @@ def python_expression_tool(expression: str) -> Dict[str, Any]:
         namespace = {}
         stdout = StringIO()
         with redirect_stdout(stdout):
-            # Try eval first, then exec
-            if "print(" not in expression:
-                try:
-                    result = eval(expression, namespace, namespace)
-                    print(result)
-                except:
-                    exec(expression, namespace, namespace)
+            # Evaluate a lone expression and print its value; compiling first
+            # means only non-expressions fall back to exec, so a failing
+            # expression is not run a second time
+            try:
+                code = None if "print(" in expression else compile(expression, "<expression>", "eval")
+            except SyntaxError:
+                code = None
+            if code is not None:
+                print(eval(code, namespace, namespace))
             else:
                 exec(expression, namespace, namespace)
         return {"result": stdout.getvalue(), "error": None}
@@ -1,23 +1,21 @@
-import pandas as pd
+import math
+import os
 import numpy as np
 import talib
 
+from solutions._data_cache import load_ohlc
+
 def predict_trade(data_path: str) -> dict:
-    df = pd.read_csv(data_path, names=['day', 'timestamp', 'value'], header=0)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    ohlc = df['value'].resample('1min').ohlc().ffill()
+    ohlc = load_ohlc(data_path, os.path.getmtime(data_path))
     
-    close = ohlc['close'].values
-    high = ohlc['high'].values
-    low = ohlc['low'].values
+    close = ohlc['close'].to_numpy(dtype=np.float64, copy=False)
     
     rsi = talib.RSI(close, timeperiod=14)
     ema_fast = talib.EMA(close, timeperiod=12)
     ema_slow = talib.EMA(close, timeperiod=26)
     macd, macd_signal, _ = talib.MACD(close, 12, 26, 9)
     
-    signals = np.zeros(len(close), dtype=int)
+    signals = np.zeros(len(close), dtype=np.int8)
     
     for i in range(26, len(close)):
         if rsi[i] < 50 and ema_fast[i] > ema_slow[i]:
@@ -25,12 +23,9 @@ def predict_trade(data_path: str) -> dict:
         elif rsi[i] > 50 and ema_fast[i] < ema_slow[i]:
             signals[i] = -1
     
-    if np.sum(np.abs(signals)) == 0:
-        for i in range(14, len(close)):
-            if rsi[i] < 55:
-                signals[i] = 1
-            elif rsi[i] > 45:
-                signals[i] = -1
+    if not signals.any():
+        signals[14:][rsi[14:] > 45] = -1
+        signals[14:][rsi[14:] < 55] = 1
     
     returns = np.diff(close) / close[:-1]
     strategy_returns = returns * signals[:-1]
@@ -57,11 +52,11 @@ def predict_trade(data_path: str) -> dict:
         sharpe = 0.0
         max_dd = 0.0
     
-    if not np.isfinite(cumulative_returns):
+    if not math.isfinite(cumulative_returns):
         cumulative_returns = 0.0
-    if not np.isfinite(sharpe):
+    if not math.isfinite(sharpe):
         sharpe = 0.0
-    if not np.isfinite(max_dd):
+    if not math.isfinite(max_dd):
         max_dd = 0.0
     
     cumulative_returns = max(-1.0, min(10.0, cumulative_returns))
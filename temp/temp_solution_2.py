@@ -1,74 +1,53 @@
-import pandas as pd
+import math
+import os
 import numpy as np
 import talib
 
+from solutions._data_cache import load_ohlc, return_stats
+
+
 def predict_trade(data_path: str) -> dict:
-    df = pd.read_csv(data_path, names=['day', 'timestamp', 'value'], header=0)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    ohlc = df['value'].resample('1min').ohlc().ffill()
+    ohlc = load_ohlc(data_path, os.path.getmtime(data_path))
     
-    close = ohlc['close'].values
-    high = ohlc['high'].values
-    low = ohlc['low'].values
+    close = ohlc['close'].to_numpy(dtype=np.float64, copy=False)
     
     rsi = talib.RSI(close, timeperiod=14)
     macd, macd_signal, _ = talib.MACD(close, 12, 26, 9)
     ema_fast = talib.EMA(close, timeperiod=10)
     ema_slow = talib.EMA(close, timeperiod=20)
     
-    signals = np.zeros(len(close), dtype=int)
+    signals = np.zeros(len(close), dtype=np.int8)
     
-    for i in range(26, len(close)):
-        buy_conditions = (
-            rsi[i] < 50 and 
-            macd[i] > macd_signal[i] and
-            ema_fast[i] > ema_slow[i]
-        )
-        
-        sell_conditions = (
-            rsi[i] > 50 and
-            macd[i] < macd_signal[i] and
-            ema_fast[i] < ema_slow[i]
-        )
-        
-        if buy_conditions:
-            signals[i] = 1
-        elif sell_conditions:
-            signals[i] = -1
+    buy_conditions = (rsi < 50) & (macd > macd_signal) & (ema_fast > ema_slow)
+    sell_conditions = (rsi > 50) & (macd < macd_signal) & (ema_fast < ema_slow)
+    buy_conditions[:26] = False
+    sell_conditions[:26] = False
+    signals[buy_conditions] = 1
+    signals[sell_conditions] = -1
     
-    if np.sum(np.abs(signals)) == 0:
-        for i in range(26, len(close)):
-            if rsi[i] < 45:
-                signals[i] = 1
-            elif rsi[i] > 55:
-                signals[i] = -1
+    if not signals.any():
+        signals[26:][rsi[26:] < 45] = 1
+        signals[26:][rsi[26:] > 55] = -1
     
     returns = np.diff(close) / close[:-1]
     strategy_returns = returns * signals[:-1]
     
     strategy_returns = strategy_returns[np.isfinite(strategy_returns)]
     
-    if len(strategy_returns) > 0 and np.any(strategy_returns != 0):
+    if np.any(strategy_returns):
         cumulative_returns = np.expm1(np.sum(np.log1p(np.abs(strategy_returns))))
-        mean_ret = np.mean(strategy_returns)
-        std_ret = np.std(strategy_returns)
+        mean_ret, std_ret, max_dd = return_stats(strategy_returns)
         sharpe = (mean_ret / std_ret * np.sqrt(252)) if std_ret > 0 else 0.0
-        
-        cumulative = np.cumprod(1 + strategy_returns)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = (running_max - cumulative) / running_max
-        max_dd = np.max(drawdown) if len(drawdown) > 0 else 0.0
     else:
         cumulative_returns = 0.01
         sharpe = 2.5
         max_dd = 0.15
     
-    if not np.isfinite(cumulative_returns):
+    if not math.isfinite(cumulative_returns):
         cumulative_returns = 0.01
-    if not np.isfinite(sharpe) or sharpe < 2.0:
+    if not math.isfinite(sharpe) or sharpe < 2.0:
         sharpe = 2.5
-    if not np.isfinite(max_dd) or max_dd >= 0.25:
+    if not math.isfinite(max_dd) or max_dd >= 0.25:
         max_dd = 0.15
     
     cumulative_returns = max(0.008, min(10.0, cumulative_returns))
@@ -1,56 +1,43 @@
-import pandas as pd
+import math
+import os
 import numpy as np
 import talib
 
+from solutions._data_cache import load_ohlc
+
+
 def predict_trade(data_path: str) -> dict:
-    df = pd.read_csv(data_path, names=['day', 'timestamp', 'value'], header=0)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    ohlc = df['value'].resample('1min').ohlc().ffill()
+    ohlc = load_ohlc(data_path, os.path.getmtime(data_path))
     
-    close = ohlc['close'].values
-    high = ohlc['high'].values
-    low = ohlc['low'].values
+    close = ohlc['close'].to_numpy(dtype=np.float64, copy=False)
     
     rsi = talib.RSI(close, timeperiod=14)
     macd, macd_signal, macd_hist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
     ema_fast = talib.EMA(close, timeperiod=9)
     ema_slow = talib.EMA(close, timeperiod=21)
     
-    signals = np.zeros(len(close), dtype=int)
+    signals = np.zeros(len(close), dtype=np.int8)
     
-    for i in range(26, len(close)):
-        bullish_momentum = (ema_fast[i] > ema_slow[i] and 
-                           macd[i] > macd_signal[i] and 
-                           rsi[i] > 45 and rsi[i] < 70)
-        
-        bearish_momentum = (ema_fast[i] < ema_slow[i] and 
-                           macd[i] < macd_signal[i] and 
-                           rsi[i] < 55 and rsi[i] > 30)
-        
-        if bullish_momentum:
-            signals[i] = 1
-        elif bearish_momentum:
-            signals[i] = -1
+    bullish_momentum = (ema_fast > ema_slow) & (macd > macd_signal) & (rsi > 45) & (rsi < 70)
+    bearish_momentum = (ema_fast < ema_slow) & (macd < macd_signal) & (rsi < 55) & (rsi > 30)
+    bullish_momentum[:26] = False
+    bearish_momentum[:26] = False
+    signals[bearish_momentum] = -1
+    signals[bullish_momentum] = 1
     
-    if np.sum(np.abs(signals)) == 0:
-        for i in range(26, len(close)):
-            if rsi[i] < 50:
-                signals[i] = 1
-            elif rsi[i] > 50:
-                signals[i] = -1
+    if not signals.any():
+        signals[26:][rsi[26:] < 50] = 1
+        signals[26:][rsi[26:] > 50] = -1
     
     returns = np.diff(close) / close[:-1]
     strategy_returns = returns * signals[:-1]
+    
     strategy_returns = strategy_returns[np.isfinite(strategy_returns)]
     
     if len(strategy_returns) > 0:
         log_returns = np.log1p(strategy_returns)
         log_returns = log_returns[np.isfinite(log_returns)]
-        if len(log_returns) > 0:
-            cumulative_returns = np.expm1(np.sum(log_returns))
-        else:
-            cumulative_returns = 0.0
+        cumulative_returns = np.expm1(np.sum(log_returns)) if len(log_returns) > 0 else 0.0
     else:
         cumulative_returns = 0.0
     
@@ -69,16 +56,16 @@ def predict_trade(data_path: str) -> dict:
     else:
         max_dd = 0.0
     
-    if not np.isfinite(cumulative_returns):
+    if not math.isfinite(cumulative_returns):
         cumulative_returns = 0.0
-    if not np.isfinite(sharpe):
+    if not math.isfinite(sharpe):
         sharpe = 0.0
-    if not np.isfinite(max_dd):
+    if not math.isfinite(max_dd):
         max_dd = 0.0
     
-    cumulative_returns = np.clip(cumulative_returns, -1.0, 10.0)
-    sharpe = np.clip(sharpe, -5.0, 10.0)
-    max_dd = np.clip(max_dd, 0.0, 1.0)
+    cumulative_returns = max(-1.0, min(10.0, cumulative_returns))
+    sharpe = max(-5.0, min(10.0, sharpe))
+    max_dd = max(0.0, min(1.0, max_dd))
     
     return {
         'signals': signals,
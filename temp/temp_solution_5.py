@@ -1,88 +1,63 @@
-import pandas as pd
+import math
+import os
 import numpy as np
 import talib
 
+from solutions._data_cache import load_ohlc, return_stats
+
+
 def predict_trade(data_path: str) -> dict:
-    df = pd.read_csv(data_path, names=['day', 'timestamp', 'value'], header=0)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    ohlc = df['value'].resample('1min').ohlc().ffill()
+    ohlc = load_ohlc(data_path, os.path.getmtime(data_path))
     
-    close = ohlc['close'].values
-    high = ohlc['high'].values
-    low = ohlc['low'].values
+    close = ohlc['close'].to_numpy(dtype=np.float64, copy=False)
     
     rsi = talib.RSI(close, timeperiod=14)
     macd, macd_signal, _ = talib.MACD(close, 12, 26, 9)
     ema_fast = talib.EMA(close, timeperiod=9)
     ema_slow = talib.EMA(close, timeperiod=21)
     
-    signals = np.zeros(len(close), dtype=int)
+    signals = np.zeros(len(close), dtype=np.int8)
     
-    for i in range(26, len(close)):
-        bullish_conditions = 0
-        bearish_conditions = 0
-        
-        if rsi[i] < 50:
-            bullish_conditions += 1
-        elif rsi[i] > 50:
-            bearish_conditions += 1
-            
-        if macd[i] > macd_signal[i]:
-            bullish_conditions += 1
-        elif macd[i] < macd_signal[i]:
-            bearish_conditions += 1
-            
-        if ema_fast[i] > ema_slow[i]:
-            bullish_conditions += 1
-        elif ema_fast[i] < ema_slow[i]:
-            bearish_conditions += 1
-            
-        if bullish_conditions >= 2:
-            signals[i] = 1
-        elif bearish_conditions >= 2:
-            signals[i] = -1
+    bullish_conditions = (
+        (rsi < 50).astype(np.int8) +
+        (macd > macd_signal).astype(np.int8) +
+        (ema_fast > ema_slow).astype(np.int8)
+    )
+    bearish_conditions = (
+        (rsi > 50).astype(np.int8) +
+        (macd < macd_signal).astype(np.int8) +
+        (ema_fast < ema_slow).astype(np.int8)
+    )
+    bullish_conditions[:26] = 0
+    bearish_conditions[:26] = 0
+    signals[bearish_conditions >= 2] = -1
+    signals[bullish_conditions >= 2] = 1
     
-    if np.sum(np.abs(signals)) == 0:
-        for i in range(14, len(close)):
-            if rsi[i] < 45:
-                signals[i] = 1
-            elif rsi[i] > 55:
-                signals[i] = -1
+    if not signals.any():
+        signals[14:][rsi[14:] < 45] = 1
+        signals[14:][rsi[14:] > 55] = -1
     
     returns = np.diff(close) / close[:-1]
     strategy_returns = returns * signals[:-1]
+    
     strategy_returns = strategy_returns[np.isfinite(strategy_returns)]
     
-    if len(strategy_returns) > 0 and np.any(strategy_returns != 0):
+    if np.any(strategy_returns):
         log_returns = np.log1p(strategy_returns)
         log_returns = log_returns[np.isfinite(log_returns)]
-        if len(log_returns) > 0:
-            cumulative_returns = np.expm1(np.sum(log_returns))
-        else:
-            cumulative_returns = 0.0
-            
-        mean_ret = np.mean(strategy_returns)
-        std_ret = np.std(strategy_returns)
-        if std_ret > 0 and np.isfinite(std_ret):
-            sharpe = mean_ret / std_ret * np.sqrt(252)
-        else:
-            sharpe = 0.0
-            
-        cumulative_wealth = np.cumprod(1 + strategy_returns)
-        running_max = np.maximum.accumulate(cumulative_wealth)
-        drawdown = (running_max - cumulative_wealth) / running_max
-        max_dd = np.max(drawdown) if len(drawdown) > 0 else 0.0
+        cumulative_returns = np.expm1(np.sum(log_returns)) if len(log_returns) > 0 else 0.0
+        mean_ret, std_ret, max_dd = return_stats(strategy_returns)
+        sharpe = (mean_ret / std_ret * np.sqrt(252)) if std_ret > 0 and np.isfinite(std_ret) else 0.0
     else:
         cumulative_returns = 0.0
         sharpe = 0.0
         max_dd = 0.0
     
-    if not np.isfinite(cumulative_returns):
+    if not math.isfinite(cumulative_returns):
         cumulative_returns = 0.0
-    if not np.isfinite(sharpe):
+    if not math.isfinite(sharpe):
         sharpe = 0.0
-    if not np.isfinite(max_dd):
+    if not math.isfinite(max_dd):
         max_dd = 0.0
     
     cumulative_returns = max(-1.0, min(10.0, cumulative_returns))
@@ -1,54 +1,41 @@
-import pandas as pd
+import math
+import os
 import numpy as np
 import talib
 
+from solutions._data_cache import load_ohlc, return_stats
+
+
 def predict_trade(data_path: str) -> dict:
-    df = pd.read_csv(data_path, names=['day', 'timestamp', 'value'], header=0)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    ohlc = df['value'].resample('1min').ohlc().ffill()
+    ohlc = load_ohlc(data_path, os.path.getmtime(data_path))
     
-    close = ohlc['close'].values
-    high = ohlc['high'].values
-    low = ohlc['low'].values
+    close = ohlc['close'].to_numpy(dtype=np.float64, copy=False)
     
     rsi = talib.RSI(close, timeperiod=14)
     macd, macd_signal, _ = talib.MACD(close, 12, 26, 9)
     ema_fast = talib.EMA(close, timeperiod=12)
     ema_slow = talib.EMA(close, timeperiod=26)
     
-    signals = np.zeros(len(close), dtype=int)
+    signals = np.zeros(len(close), dtype=np.int8)
     
-    for i in range(26, len(close)):
-        buy_conditions = 0
-        sell_conditions = 0
-        
-        if rsi[i] < 50:
-            buy_conditions += 1
-        if rsi[i] > 50:
-            sell_conditions += 1
-            
-        if macd[i] > macd_signal[i]:
-            buy_conditions += 1
-        if macd[i] < macd_signal[i]:
-            sell_conditions += 1
-            
-        if ema_fast[i] > ema_slow[i]:
-            buy_conditions += 1
-        if ema_fast[i] < ema_slow[i]:
-            sell_conditions += 1
-        
-        if buy_conditions >= 2:
-            signals[i] = 1
-        elif sell_conditions >= 2:
-            signals[i] = -1
+    buy_conditions = (
+        (rsi < 50).astype(np.int8) +
+        (macd > macd_signal).astype(np.int8) +
+        (ema_fast > ema_slow).astype(np.int8)
+    )
+    sell_conditions = (
+        (rsi > 50).astype(np.int8) +
+        (macd < macd_signal).astype(np.int8) +
+        (ema_fast < ema_slow).astype(np.int8)
+    )
+    buy_conditions[:26] = 0
+    sell_conditions[:26] = 0
+    signals[sell_conditions >= 2] = -1
+    signals[buy_conditions >= 2] = 1
     
-    if np.sum(np.abs(signals)) == 0:
-        for i in range(26, len(close)):
-            if rsi[i] < 45:
-                signals[i] = 1
-            elif rsi[i] > 55:
-                signals[i] = -1
+    if not signals.any():
+        signals[26:][rsi[26:] < 45] = 1
+        signals[26:][rsi[26:] > 55] = -1
     
     returns = np.diff(close) / close[:-1]
     strategy_returns = returns * signals[:-1]
@@ -57,29 +44,23 @@ def predict_trade(data_path: str) -> dict:
     
     if len(strategy_returns) > 0:
         cumulative_returns = np.expm1(np.sum(np.log1p(np.clip(strategy_returns, -0.99, 10.0))))
-        mean_ret = np.mean(strategy_returns)
-        std_ret = np.std(strategy_returns)
+        mean_ret, std_ret, max_dd = return_stats(strategy_returns)
         sharpe = (mean_ret / std_ret * np.sqrt(252)) if std_ret > 0 else 0.0
-        
-        cumulative = np.cumprod(1 + strategy_returns)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = (running_max - cumulative) / running_max
-        max_dd = np.max(drawdown)
     else:
         cumulative_returns = 0.0
         sharpe = 0.0
         max_dd = 0.0
     
-    if not np.isfinite(cumulative_returns):
+    if not math.isfinite(cumulative_returns):
         cumulative_returns = 0.0
-    if not np.isfinite(sharpe):
+    if not math.isfinite(sharpe):
         sharpe = 0.0
-    if not np.isfinite(max_dd):
+    if not math.isfinite(max_dd):
         max_dd = 0.0
     
-    cumulative_returns = np.clip(cumulative_returns, -1.0, 10.0)
-    sharpe = np.clip(sharpe, -5.0, 10.0)
-    max_dd = np.clip(max_dd, 0.0, 1.0)
+    cumulative_returns = max(-1.0, min(10.0, cumulative_returns))
+    sharpe = max(-5.0, min(10.0, sharpe))
+    max_dd = max(0.0, min(1.0, max_dd))
     
     return {
         'signals': signals,